@@ -1,9 +1,13 @@
 import streamlit as st
 import matplotlib.pyplot as plt
 import pandas as pd
+import numpy as np
 import io
+import math
+import re
 # Using the function from the uploaded file directly
-from gc_content import gc_content 
+from gc_content import is_valid_dna, analyze_sequences, scan_fasta
+from themes import THEME_COLORS, ABOUT_HTML, CARD_TEMPLATE
 
 
 st.set_page_config(page_title="GC Content Analyzer", layout="wide")
@@ -24,24 +28,6 @@ st.markdown("""
 # --- ------------------- ---
 theme_option = st.sidebar.selectbox("Choose Theme", ["Light", "Dark"])
 
-# --- Theme colors ---
-if theme_option == "Light":
-    metric_bg = "#F0F2F6"
-    text_color = "#000000"
-    chart_colors = ["#2E86C1", "#FFBB33"]
-    chart_bg = "white"
-    desc_bg = "#f0f2f6"
-    desc_text = "#333333"
-    highlight = "#2E86C1"
-else:
-    metric_bg = "#262730"
-    text_color = "#FAFAFA"
-    chart_colors = ["#4CAF50", "#FF9999"]
-    chart_bg = "#1e1e1e"
-    desc_bg = "#1e1e1e"
-    desc_text = "#f5f5f5"
-    highlight = "#4FC3F7"
-
 # --- Initialize session state ---
 if "seq_input" not in st.session_state:
     st.session_state.seq_input = ""
@@ -49,9 +35,10 @@ if "sequences" not in st.session_state:
     st.session_state.sequences = []
 if "uploaded_file_name" not in st.session_state:
     st.session_state.uploaded_file_name = None
-# Flag and key counter for file uploader reset
-if "clear_flag" not in st.session_state:
-    st.session_state.clear_flag = False
+# Uploads are scored while parsing, so their results are kept instead of their sequences
+if "scored_upload" not in st.session_state:
+    st.session_state.scored_upload = None
+# Key counter for file uploader reset
 if "file_uploader_key" not in st.session_state:
     st.session_state.file_uploader_key = 0
 if "current_option" not in st.session_state:
@@ -65,36 +52,179 @@ def clean_header(header: str) -> str:
         return header
     return header.split()[0].strip()
 
-def parse_fasta(text):
-    """Parses FASTA format, returning (header, sequence) tuples."""
+# One FASTA record: the first word of the header, then every following line up to the next
+# line starting with '>' (leading spaces/tabs allowed, as the line-stripping parser did)
+_FASTA_RE = re.compile(rb"^[ \t]*>[ \t]*(\S+)[^\n]*\n?((?:(?![ \t]*>)[^\n]+\n?|\n)*)", re.M)
+_WHITESPACE = b" \t\r\n"
+
+@st.cache_data
+def parse_fasta(data: bytes):
+    """Parses FASTA bytes in a single regex scan, returning (header, sequence) tuples."""
     fasta_seqs = []
-    lines = text.strip().splitlines()
-    header = None
-    seq_lines = []
-    for line in lines:
-        line = line.strip()
-        if not line:
-            continue
-        if line.startswith(">"):
-            if header and seq_lines:
-                fasta_seqs.append((clean_header(header), "".join(seq_lines).upper()))
-            header = line[1:].strip()
-            seq_lines = []
-        else:
-            seq_lines.append(line.replace(" ", "").replace("\n", ""))
-    if header and seq_lines:
-        fasta_seqs.append((clean_header(header), "".join(seq_lines).upper()))
+    for match in _FASTA_RE.finditer(data):
+        # bytes.translate strips all whitespace from the record in one C loop
+        seq = match.group(2).translate(None, _WHITESPACE)
+        if seq:
+            fasta_seqs.append((match.group(1).decode("utf-8", "replace"), seq.decode("ascii", "replace")))
     return fasta_seqs
 
+@st.cache_data
+def compute_results(seq_tuples: tuple[tuple[str, str], ...]):
+    """Computes GC% per sequence, returning (results, gc_values, lengths, names, duplicates); cached across reruns."""
+    seq_tuples = [(header, seq) for header, seq in seq_tuples if seq]
+
+    # Score each distinct sequence once; dict lookups compare full strings, so no false matches
+    unique_seqs = list(dict.fromkeys(seq for _, seq in seq_tuples))
+    gc_percent, _ = analyze_sequences(unique_seqs)
+    gc_by_seq = dict(zip(unique_seqs, gc_percent.tolist()))
+
+    # Charts and summary stats use the preallocated fp32 gc_values; the result rows keep the
+    # float64 scores that the table and downloads are built from
+    n = len(seq_tuples)
+    results = [None] * n
+    gc_values = np.empty(n, dtype=np.float32)
+    lengths = np.empty(n, dtype=np.int64)
+    names = [None] * n
+
+    for i, (header, seq) in enumerate(seq_tuples):
+        gc = gc_by_seq[seq]
+        name = header
+
+        results[i] = (name, len(seq), gc)
+        gc_values[i] = gc
+        lengths[i] = len(seq)
+        names[i] = name
+
+    duplicates = n - len(unique_seqs)
+    return results, gc_values, lengths, names, duplicates
+
+@st.cache_data
+def score_upload(data: bytes):
+    """Scores an uploaded FASTA file straight from its bytes, returning (results, gc_values, lengths, names, invalid_headers)."""
+    records = scan_fasta(data)
+    invalid_headers = [clean_header(header) for header, _, _, valid in records if not valid]
+    records = [record for record in records if record[3]]
+
+    n = len(records)
+    results = [None] * n
+    gc_values = np.empty(n, dtype=np.float32)
+    lengths = np.empty(n, dtype=np.int64)
+    names = [None] * n
+
+    for i, (header, length, gc, _) in enumerate(records):
+        name = clean_header(header)
+
+        results[i] = (name, length, gc)
+        gc_values[i] = gc
+        lengths[i] = length
+        names[i] = name
+
+    return results, gc_values, lengths, names, invalid_headers
+
+def hash_frame(df: pd.DataFrame) -> bytes:
+    """Hashes every row of the frame; Streamlit only samples frames of 50k+ rows."""
+    return pd.util.hash_pandas_object(df, index=False).values.tobytes()
+
+@st.cache_data(hash_funcs={pd.DataFrame: hash_frame})
+def build_csv(df: pd.DataFrame) -> bytes:
+    """Builds the CSV download once per result set."""
+    return df.to_csv(index=False).encode("utf-8")
+
+@st.cache_data(hash_funcs={pd.DataFrame: hash_frame})
+def build_excel(df: pd.DataFrame) -> bytes:
+    """Builds the Excel download once per result set."""
+    excel_buffer = io.BytesIO()
+    df.to_excel(excel_buffer, index=False, engine="xlsxwriter")
+    return excel_buffer.getvalue()
+
+def render_charts(results, gc_values, names, theme_option):
+    """Draws the Graphs tab from already computed results."""
+    colors = THEME_COLORS[theme_option]
+    text_color = colors["text_color"]
+    chart_colors = colors["chart_colors"]
+    chart_bg = colors["chart_bg"]
+
+    fig, ax = plt.subplots(1, 2, figsize=(10, 4))
+
+    if theme_option == "Dark":
+        fig.patch.set_facecolor(chart_bg)
+        ax[0].set_facecolor(chart_bg)
+        ax[1].set_facecolor(chart_bg)
+
+        for axis in ax:
+            axis.tick_params(colors=text_color)
+            axis.yaxis.label.set_color(text_color)
+            axis.xaxis.label.set_color(text_color)
+            axis.title.set_color(text_color)
+            for spine in axis.spines.values():
+                spine.set_color(text_color)
+    else:
+         plt.rcParams.update(plt.rcParamsDefault)
+
+    # Histogram, pre-binned in NumPy and drawn as plain bars; fp32 is plenty for percentages
+    gc_array = np.asarray(gc_values, dtype=np.float32)
+    counts, edges = np.histogram(gc_array, bins=10)
+    ax[0].bar(edges[:-1], counts, width=np.diff(edges), align="edge", color=chart_colors[0], edgecolor="black")
+    ax[0].set_xlabel("GC%")
+    ax[0].set_ylabel("Frequency")
+    ax[0].set_title("GC Content Distribution")
+
+    # Bar chart
+    ax[1].bar(names, gc_array, color=chart_colors[0], edgecolor="black")
+    ax[1].set_xlabel("Sequences")
+    ax[1].set_ylabel("GC%")
+    ax[1].set_title("GC% per Sequence")
+
+    rotation = 45 if len(names) > 5 else 0
+    plt.setp(ax[1].xaxis.get_majorticklabels(), rotation=rotation, ha="right" if rotation else "center")
+
+    plt.tight_layout()
+    st.pyplot(fig)
+    plt.close(fig) 
+
+    # Pie charts
+    st.subheader("GC vs AT Composition")
+    num_per_row = 2
+    # Pies are drawn in batches of fixed-size figures so memory and render time per image stay bounded
+    rows_per_figure = 10
+    per_figure = num_per_row * rows_per_figure
+    for batch_start in range(0, len(results), per_figure):
+        batch = results[batch_start:batch_start + per_figure]
+        nrows = math.ceil(len(batch) / num_per_row)
+        fig, axes = plt.subplots(nrows, num_per_row, figsize=(4 * num_per_row, 3 * nrows), squeeze=False)
+        if theme_option == "Dark":
+            fig.patch.set_facecolor(chart_bg)
+
+        for ax, (name, length, gc) in zip(axes.flat, batch):
+            at = 100 - gc
+
+            if theme_option == "Dark":
+                 ax.set_facecolor(chart_bg)
+                 ax.set_title(name, fontsize=10, pad=6, color=text_color)
+            else:
+                 ax.set_title(name, fontsize=10, pad=6)
+
+            ax.pie([gc, at], labels=None, autopct="%.1f%%", colors=chart_colors, textprops={"fontsize": 10})
+
+            ax.legend(["GC%", "AT%"], loc="center left", bbox_to_anchor=(1, 0.5), fontsize=8, frameon=False, labelcolor=text_color)
+
+        # Hide the empty slots in the last row
+        for ax in axes.flat[len(batch):]:
+            ax.set_visible(False)
+
+        plt.tight_layout()
+        st.pyplot(fig)
+        plt.close(fig)
+
 def submit_sequences():
     """Processes pasted text and updates session state."""
-    text = st.session_state.seq_input.strip().upper()
+    text = st.session_state.seq_input.strip()
     valid_seqs = []
     
     if text.startswith(">"):
-        fasta_seqs = parse_fasta(text)
+        fasta_seqs = parse_fasta(text.encode("utf-8"))
         for header, seq in fasta_seqs:
-            if seq and all(base in "ATGC" for base in seq):
+            if is_valid_dna(seq):
                 valid_seqs.append((header, seq))
             elif seq:
                 
@@ -102,7 +232,7 @@ def submit_sequences():
     else:
         sequences_list = [seq.strip().replace(" ", "").replace("\n", "") for seq in text.split(",") if seq.strip()]
         for i, seq in enumerate(sequences_list, start=1):
-            if seq and all(base in "ATGC" for base in seq):
+            if is_valid_dna(seq):
                 valid_seqs.append((f"Sequence_{i}", seq))
             elif seq:
                 st.sidebar.error(f" Invalid characters in Sequence {i}. Only A, T, G, C are allowed.")
@@ -111,45 +241,39 @@ def submit_sequences():
     st.session_state.uploaded_file_name = None
 
 def trigger_clear_sequences():
-    """Sets the flag and increments the key to force reset and trigger rerun."""
+    """Clears all sequences and resets the uploader; runs before the button's rerun."""
     st.session_state.update({
         "seq_input": "", 
         "sequences": [], 
         "uploaded_file_name": None,
-        "clear_flag": True, 
+        "scored_upload": None,
     })
     
  
     if st.session_state.get("current_option") == "Upload FASTA File":
         st.session_state.file_uploader_key += 1 
 
-
-# --- RERUN LOGIC ---
-if st.session_state.clear_flag:
-    st.session_state.clear_flag = False # Reset the flag
-    st.rerun() 
-# --- END RERUN LOGIC ---
+def switch_input_option():
+    """Clears all active data when the input mode changes; runs before the radio's rerun."""
+    st.session_state.sequences = []
+    st.session_state.uploaded_file_name = None
+    st.session_state.scored_upload = None
+    st.session_state.seq_input = ""
+    # Increment the uploader key to ensure the file widget is fully destroyed and redrawn
+    st.session_state.file_uploader_key += 1 
 
 
 # === Sidebar Inputs ===
 st.sidebar.header("Input Options")
 
+# The radio writes the selected mode straight into current_option
 option = st.sidebar.radio(
     "How do you want to input sequences?",
-    ("Upload FASTA File", "Paste Sequence Directly")
+    ("Upload FASTA File", "Paste Sequence Directly"),
+    key="current_option",
+    on_change=switch_input_option
 )
 
-# Logic to force a clean state change when switching input modes
-if option != st.session_state.current_option:
-    # If the user switches input modes, clear all active data and force a clean state
-    st.session_state.sequences = []
-    st.session_state.uploaded_file_name = None
-    st.session_state.seq_input = ""
-    st.session_state.current_option = option
-    # Increment the uploader key to ensure the file widget is fully destroyed and redrawn
-    st.session_state.file_uploader_key += 1 
-    st.rerun() # Rerun immediately for clean switch
-
 # Define the input container
 input_container = st.sidebar.container()
 
@@ -165,32 +289,30 @@ if option == "Upload FASTA File":
     # Logic to process the uploaded file
     if uploaded_file is not None:
         try:
-            file_content = uploaded_file.getvalue().decode("utf-8")
-            
-            # Use the existing fasta parser logic
-            parsed_sequences = parse_fasta(file_content)
-            
-            valid_seqs = []
-            for header, seq in parsed_sequences:
-                if seq and all(base in "ATGC" for base in seq): 
-                    valid_seqs.append((header, seq))
-                elif seq:
-                    input_container.warning(f" Sequence '{header}' skipped due to invalid characters. Only A, T, G, C allowed.")
+            # Parse, validate and score in one pass over the raw bytes;
+            # getvalue() shares the upload buffer without copying
+            results, gc_values, lengths, names, invalid_headers = score_upload(uploaded_file.getvalue())
+
+            for header in invalid_headers:
+                input_container.warning(f" Sequence '{header}' skipped due to invalid characters. Only A, T, G, C allowed.")
             
-            st.session_state.sequences = valid_seqs
+            st.session_state.sequences = []
+            st.session_state.scored_upload = (results, gc_values, lengths, names, 0)
             st.session_state.uploaded_file_name = uploaded_file.name
             
-            if not st.session_state.sequences:
+            if not results:
                 input_container.error(" No valid DNA sequences found in the uploaded file.")
                 
         except Exception as e:
             input_container.error(f" Error processing file: {e}")
             st.session_state.sequences = []
+            st.session_state.scored_upload = None
             st.session_state.uploaded_file_name = None
     else:
    
         if st.session_state.uploaded_file_name:
              st.session_state.sequences = []
+             st.session_state.scored_upload = None
              st.session_state.uploaded_file_name = None
 
 
@@ -224,54 +346,8 @@ sequences = st.session_state.sequences
 
 if not sequences and not st.session_state.uploaded_file_name:
     
-    # --- About Section ---
-    st.markdown(f"""
-    <div style='background-color:{desc_bg}; padding:22px; border-radius:12px; margin-bottom:20px;'>
-    <h3 style='color:{highlight}; margin-top:0;'>About This Tool</h3>
-    <p style='font-size:16px; color:{desc_text};'>
-    The <b>GC Content Analysis Tool</b> helps you explore DNA composition by calculating
-    the <b>GC content</b>  (the proportion of guanine (G) and cytosine (C) bases in your DNA sequences).
-    </p>
-    <ul style='font-size:16px; color:{desc_text}; margin-left:25px;'>
-    <li><b>GC-rich DNA</b> is more stable and melts at higher temperatures.</li>
-    <li><b>AT-rich regions</b> are generally more flexible and easier to separate.</li>
-    <li>GC content patterns can reflect gene function, species variation, or genome structure.</li>
-    </ul>
-    <p style='font-size:16px; color:{desc_text};'>
-    This tool lets you upload or paste sequences, visualize GC distribution through charts,
-    and download results instantly for further analysis.
-    </p>
-    <hr style='border:0.5px solid #888888; margin:15px 0;'>
-    <p style='font-size:15px; color:{desc_text};'>
-    <i>Quick takeaway:</i> GC content offers a clear, powerful look into DNA stability.
-    </div>
-    """, unsafe_allow_html=True)
-    
-    # --- Highlight Cards ---
-    st.markdown(f"""
-    <div style='display:flex; gap:20px; flex-wrap:wrap; margin-top:20px;'>
-    <div style='flex:1; min-width:280px; background-color:{desc_bg}; padding:15px; border-radius:12px; text-align:center; box-shadow: 0px 3px 8px rgba(0,0,0,0.1);'>
-    <h4 style='color:{highlight};'>Easy Input</h4>
-    <p style='color:{desc_text};'>Upload a FASTA file or paste sequences directly. No formatting headaches.</p>
-    </div>
-    <div style='flex:1; min-width:280px; background-color:{desc_bg}; padding:15px; border-radius:12px; text-align:center; box-shadow: 0px 3px 8px rgba(0,0,0,0.1);'>
-    <h4 style='color:{highlight};'>Instant Analysis</h4>
-    <p style='color:{desc_text};'>Get GC% stats, charts, and downloadable reports in one click.</p>
-    </div>
-    </div>
-    """, unsafe_allow_html=True)
-    
-    
-    st.markdown(f"""
-    <div style='background-color:{desc_bg}; padding:20px; border-radius:12px; margin-top:20px;'>
-    <h3 style='color:{highlight}; margin-top:0;'> For Non-biologists:</h3>
-    <p style='font-size:16px; color:{desc_text};'>
-    Think of your DNA like a recipe written in four letters: A, T, G, and C. 
-    This app checks how much of your recipe is made up of the 'stronger ingredients' - G and C. 
-    The more GC you’ve got, the tougher your DNA tends to be. It’s that simple!
-    </p>
-    </div>
-    """, unsafe_allow_html=True)
+    # --- About, Highlight Cards and Non-biologist sections ---
+    st.markdown(ABOUT_HTML[theme_option], unsafe_allow_html=True)
 
     st.info("👈 Please paste a DNA sequence or upload a FASTA file in the sidebar to begin analysis.")
 
@@ -281,22 +357,22 @@ else:
     
     st.subheader("Results")
 
-    results, gc_values, names = [], [], []
+    if st.session_state.scored_upload is not None:
+        results, gc_values, lengths, names, duplicates = st.session_state.scored_upload
+    else:
+        results, gc_values, lengths, names, duplicates = compute_results(tuple(sequences))
 
-    for header, seq in sequences:
-        if not seq: 
-            continue 
+    if duplicates:
+        st.caption(f"{duplicates} duplicate sequence(s) reused an earlier result instead of being rescored.")
 
-        gc = gc_content(seq)
-        name = header 
-        
-        results.append((name, len(seq), gc))
-        gc_values.append(gc)
-        names.append(name)
-        
     if not results:
         st.error(" All sequences contained invalid characters or were empty and have been skipped.")
     else:
+        # Built once from typed arrays and shared by the table and download tabs; GC% stays
+        # float64 for the exports, fp32 gc_values is only for charts
+        gc_scores = np.fromiter((gc for _, _, gc in results), dtype=np.float64, count=len(results))
+        df = pd.DataFrame({"Sequence Name": names, "Length": lengths, "GC%": gc_scores})
+
         # === Tabs ===
         tab1, tab2, tab3, tab4 = st.tabs([" Overview", " Graphs", " Results Table", " Downloads"])
 
@@ -304,103 +380,37 @@ else:
         with tab1:
             st.subheader("Summary Statistics")
             col1, col2, col3 = st.columns(3)
-            min_gc, max_gc, avg_gc = min(gc_values), max(gc_values), sum(gc_values)/len(gc_values)
+            min_gc, max_gc, avg_gc = gc_values.min(), gc_values.max(), gc_values.mean()
 
             for col, title, value in zip(
                 [col1, col2, col3],
                 ["Minimum GC%", "Maximum GC%", "Average GC%"],
                 [min_gc, max_gc, avg_gc]
             ):
-                col.markdown(f"""
-                <div style='background-color:{metric_bg}; color:{text_color}; padding:20px; border-radius:10px; text-align:center; box-shadow:0px 3px 8px rgba(0,0,0,0.1);'>
-                    <h4>{title}</h4>
-                    <h3>{value:.2f}</h3>
-                </div>
-                """, unsafe_allow_html=True)
+                col.markdown(CARD_TEMPLATE[theme_option].format(title=title, value=value), unsafe_allow_html=True)
 
         # --- Graphs Tab ---
         with tab2:
-            fig, ax = plt.subplots(1, 2, figsize=(10, 4))
-            
-          
-            if theme_option == "Dark":
-                fig.patch.set_facecolor(chart_bg)
-                ax[0].set_facecolor(chart_bg)
-                ax[1].set_facecolor(chart_bg)
-                
-                for axis in ax:
-                    axis.tick_params(colors=text_color)
-                    axis.yaxis.label.set_color(text_color)
-                    axis.xaxis.label.set_color(text_color)
-                    axis.title.set_color(text_color)
-                    for spine in axis.spines.values():
-                        spine.set_color(text_color)
-            else:
-                 plt.rcParams.update(plt.rcParamsDefault)
-
-            # Histogram
-            ax[0].hist(gc_values, bins=10, color=chart_colors[0], edgecolor="black")
-            ax[0].set_xlabel("GC%")
-            ax[0].set_ylabel("Frequency")
-            ax[0].set_title("GC Content Distribution")
-
-            # Bar chart
-            ax[1].bar(names, gc_values, color=chart_colors[0], edgecolor="black")
-            ax[1].set_xlabel("Sequences")
-            ax[1].set_ylabel("GC%")
-            ax[1].set_title("GC% per Sequence")
-            
-            rotation = 45 if len(names) > 5 else 0
-            plt.setp(ax[1].xaxis.get_majorticklabels(), rotation=rotation, ha="right" if rotation else "center")
-            
-            plt.tight_layout()
-            st.pyplot(fig)
-            plt.close(fig) 
-
-            # Pie charts
-            st.subheader("GC vs AT Composition")
-            num_per_row = 2
-            for row_start in range(0, len(results), num_per_row):
-                cols = st.columns(num_per_row)
-                for i, (name, length, gc) in enumerate(results[row_start:row_start+num_per_row]):
-                    at = 100 - gc
-                    fig, ax = plt.subplots(figsize=(3, 3))
-                    
-                    if theme_option == "Dark":
-                         fig.patch.set_facecolor(chart_bg)
-                         ax.set_facecolor(chart_bg)
-                         ax.set_title(name, fontsize=10, pad=6, color=text_color)
-                    else:
-                         ax.set_title(name, fontsize=10, pad=6)
-
-                    ax.pie([gc, at], labels=None, autopct="%.1f%%", colors=chart_colors, textprops={"fontsize": 10})
-                    
-                    ax.legend(["GC%", "AT%"], loc="center left", bbox_to_anchor=(1, 0.5), fontsize=8, frameon=False, labelcolor=text_color)
-                    cols[i].pyplot(fig)
-                    plt.close(fig) 
+            render_charts(results, gc_values, names, theme_option)
 
 
         # --- Results Table Tab ---
         with tab3:
-            df = pd.DataFrame(results, columns=["Sequence Name", "Length", "GC%"])
             st.dataframe(df)
 
         # --- Downloads Tab ---
         with tab4:
-            df = pd.DataFrame(results, columns=["Sequence Name", "Length", "GC%"])
             st.markdown("⬇️ *Click below to grab your results — instant and tidy!*")
             st.download_button(
                 "📥 Download Results as CSV",
-                df.to_csv(index=False).encode("utf-8"),
+                build_csv(df),
                 "gc_content_results.csv",
                 "text/csv",
                 key="csv_download"
             )
-            excel_buffer = io.BytesIO()
-            df.to_excel(excel_buffer, index=False, engine="openpyxl")
             st.download_button(
                 "📊 Download Results as Excel",
-                excel_buffer.getvalue(),
+                build_excel(df),
                 "gc_content_results.xlsx",
                 "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
                 key="excel_download"
@@ -2,12 +2,36 @@
 
 import argparse
 import csv
+import ctypes
+import os
+import threading
 import matplotlib.pyplot as plt
+import numpy as np
+from numba import njit, prange
+
+_ATGC = b"ATGCatgc"
+
+# Byte lookup tables, case-insensitive: 1 marks a G/C byte in _GC_LUT;
+# _BASE_LUT maps invalid bytes to 0, A/T to 1 and G/C to 2
+_GC_LUT = np.zeros(256, dtype=np.uint8)
+_GC_LUT[list(b"GCgc")] = 1
+_BASE_LUT = np.zeros(256, dtype=np.uint8)
+_BASE_LUT[list(b"ATat")] = 1
+_BASE_LUT[list(b"GCgc")] = 2
+
+# Optional SWAR counter from _gccount.c, used by gc_content() (the CLI path); the NumPy
+# lookup table is used if it isn't built or is a stale build without gc_count
+try:
+    _gccount = ctypes.CDLL(os.path.join(os.path.dirname(os.path.abspath(__file__)), "_gccount.so"))
+    _gccount.gc_count.argtypes = [ctypes.c_char_p, ctypes.c_size_t]
+    _gccount.gc_count.restype = ctypes.c_size_t
+except (OSError, AttributeError):
+    _gccount = None
 
 def read_sequences(file_path):
     sequences = []
     header = None
-    current_seq = ""
+    seq_parts = []
 
     with open(file_path, 'r') as f:
         for line in f:
@@ -15,23 +39,151 @@ def read_sequences(file_path):
             if not line:
                 continue
             if line.startswith('>'):
-                if current_seq:
-                    sequences.append((header, current_seq))
-                    current_seq = ""
+                if seq_parts:
+                    sequences.append((header, "".join(seq_parts).upper()))
+                    seq_parts = []
                 header = line[1:]
             else:
-                current_seq += line.upper()
-        if current_seq:
-            sequences.append((header, current_seq))
+                seq_parts.append(line)
+        if seq_parts:
+            sequences.append((header, "".join(seq_parts).upper()))
 
     return sequences
 
 
 def gc_content(sequence):
-    gc_count = sequence.count('G') + sequence.count('C')
+    if isinstance(sequence, str):
+        sequence = sequence.encode("ascii", "replace")
+    if _gccount is not None:
+        gc_count = _gccount.gc_count(sequence, len(sequence))
+    else:
+        gc_count = int(_GC_LUT[np.frombuffer(sequence, dtype=np.uint8)].sum())
     return (gc_count / len(sequence)) * 100 if len(sequence) > 0 else 0
 
 
+def is_valid_dna(sequence):
+    """Return True if the sequence contains only A, T, G and C (either case)."""
+    if isinstance(sequence, str):
+        # str.isascii() is O(1) in CPython, so non-ASCII input is rejected without a scan
+        if not sequence.isascii():
+            return False
+        sequence = sequence.encode("ascii")
+    # Deleting every valid base in one C loop leaves only the offending bytes
+    return not sequence.translate(None, _ATGC)
+
+
+@njit(parallel=True, cache=True)
+def _gc_and_validate(buf, offsets, lut, out_gc, out_valid):
+    # One fused pass per sequence: count G/C and flag any byte outside ATGC
+    for i in prange(len(offsets) - 1):
+        gc = 0
+        valid = True
+        for j in range(offsets[i], offsets[i + 1]):
+            c = lut[buf[j]]
+            if c == 0:
+                valid = False
+            gc += c >> 1
+        out_gc[i] = gc
+        out_valid[i] = valid
+
+
+# The default workqueue threading layer must not be entered from two threads at once
+_kernel_lock = threading.Lock()
+
+
+def analyze_sequences(sequences):
+    """Return (gc_percent, valid) arrays for a batch of sequences, validated and counted in one pass."""
+    encoded = [s.encode("ascii", "replace") if isinstance(s, str) else s for s in sequences]
+    n = len(encoded)
+    lengths = np.fromiter(map(len, encoded), dtype=np.int64, count=n)
+    offsets = np.zeros(n + 1, dtype=np.int64)
+    np.cumsum(lengths, out=offsets[1:])
+    buf = np.frombuffer(b"".join(encoded), dtype=np.uint8)
+
+    out_gc = np.zeros(n, dtype=np.int64)
+    out_valid = np.zeros(n, dtype=np.bool_)
+    with _kernel_lock:
+        _gc_and_validate(buf, offsets, _BASE_LUT, out_gc, out_valid)
+
+    gc_percent = np.zeros(n, dtype=np.float64)
+    np.divide(out_gc * 100, lengths, out=gc_percent, where=lengths > 0)
+    return gc_percent, out_valid
+
+
+@njit(parallel=True, cache=True)
+def _scan_records(buf, starts, lut, header_ends, out_gc, out_len, out_valid):
+    # One pass per FASTA record: skip the header line, then count and validate
+    # every non-whitespace byte up to the next record
+    n = len(starts)
+    for i in prange(n):
+        end = starts[i + 1] if i + 1 < n else len(buf)
+        j = starts[i]
+        while j < end and buf[j] != 10 and buf[j] != 13:
+            j += 1
+        header_ends[i] = j
+        gc = 0
+        length = 0
+        valid = True
+        for k in range(j, end):
+            b = buf[k]
+            if b == 10 or b == 13 or b == 32 or b == 9:
+                continue
+            c = lut[b]
+            if c == 0:
+                valid = False
+            gc += c >> 1
+            length += 1
+        out_gc[i] = gc
+        out_len[i] = length
+        out_valid[i] = valid
+
+
+@njit(cache=True)
+def _record_starts(buf, gt):
+    # Keep the '>' bytes that open a line, allowing leading spaces/tabs and
+    # treating both '\n' and a bare '\r' as line breaks
+    keep = np.zeros(len(gt), dtype=np.bool_)
+    for i in range(len(gt)):
+        q = gt[i]
+        while q > 0 and (buf[q - 1] == 32 or buf[q - 1] == 9):
+            q -= 1
+        keep[i] = q == 0 or buf[q - 1] == 10 or buf[q - 1] == 13
+    return gt[keep]
+
+
+def scan_fasta(data):
+    """Parse, validate and count raw FASTA bytes in one pass.
+
+    Returns (header, length, gc_percent, valid) per record without building
+    the sequence strings. Records with an empty header or sequence are dropped.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    # '>' only opens a record at the start of a line
+    starts = _record_starts(buf, np.flatnonzero(buf == 62))
+    n = len(starts)
+
+    header_ends = np.zeros(n, dtype=np.int64)
+    out_gc = np.zeros(n, dtype=np.int64)
+    out_len = np.zeros(n, dtype=np.int64)
+    out_valid = np.zeros(n, dtype=np.bool_)
+    with _kernel_lock:
+        _scan_records(buf, starts, _BASE_LUT, header_ends, out_gc, out_len, out_valid)
+
+    records = []
+    for start, header_end, gc, length, valid in zip(
+        starts.tolist(), header_ends.tolist(), out_gc.tolist(), out_len.tolist(), out_valid.tolist()
+    ):
+        header = data[start + 1:header_end].decode("utf-8", "replace").strip()
+        if header and length:
+            records.append((header, length, gc / length * 100, valid))
+    return records
+
+
+# Compile the kernels at import so the first upload doesn't pay the JIT cost
+analyze_sequences([b"ATGC"])
+scan_fasta(b">warmup\nATGC\n")
+
+
 def main():
     parser = argparse.ArgumentParser(description="GC Content Analysis Tool")
     parser.add_argument("input", help="Input FASTA/sequence file")
@@ -52,10 +204,9 @@ def main():
         return
 
     results = []
-    valid_bases = set("ATGC")
 
     for i, (header, seq) in enumerate(sequences, start=1):
-        if not set(seq).issubset(valid_bases):
+        if not is_valid_dna(seq):
             print(f"Warning: Sequence {header or f'Sequence {i}'} contains invalid characters.")
         gc = gc_content(seq)
         name = header if header else f"Sequence {i}"
@@ -0,0 +1,82 @@
+"""Theme palettes and the static HTML built from them, formatted once at import.
+
+Streamlit re-executes app.py on every interaction, but imported modules are
+cached in sys.modules, so these strings are only constructed once per process.
+"""
+
+THEME_COLORS = {
+    "Light": {
+        "metric_bg": "#F0F2F6",
+        "text_color": "#000000",
+        "chart_colors": ["#2E86C1", "#FFBB33"],
+        "chart_bg": "white",
+        "desc_bg": "#f0f2f6",
+        "desc_text": "#333333",
+        "highlight": "#2E86C1",
+    },
+    "Dark": {
+        "metric_bg": "#262730",
+        "text_color": "#FAFAFA",
+        "chart_colors": ["#4CAF50", "#FF9999"],
+        "chart_bg": "#1e1e1e",
+        "desc_bg": "#1e1e1e",
+        "desc_text": "#f5f5f5",
+        "highlight": "#4FC3F7",
+    },
+}
+
+# About, highlight cards and non-biologist blurb, sent as a single markdown block
+_INTRO_HTML = """
+<div style='background-color:{desc_bg}; padding:22px; border-radius:12px; margin-bottom:20px;'>
+<h3 style='color:{highlight}; margin-top:0;'>About This Tool</h3>
+<p style='font-size:16px; color:{desc_text};'>
+The <b>GC Content Analysis Tool</b> helps you explore DNA composition by calculating
+the <b>GC content</b>  (the proportion of guanine (G) and cytosine (C) bases in your DNA sequences).
+</p>
+<ul style='font-size:16px; color:{desc_text}; margin-left:25px;'>
+<li><b>GC-rich DNA</b> is more stable and melts at higher temperatures.</li>
+<li><b>AT-rich regions</b> are generally more flexible and easier to separate.</li>
+<li>GC content patterns can reflect gene function, species variation, or genome structure.</li>
+</ul>
+<p style='font-size:16px; color:{desc_text};'>
+This tool lets you upload or paste sequences, visualize GC distribution through charts,
+and download results instantly for further analysis.
+</p>
+<hr style='border:0.5px solid #888888; margin:15px 0;'>
+<p style='font-size:15px; color:{desc_text};'>
+<i>Quick takeaway:</i> GC content offers a clear, powerful look into DNA stability.
+</div>
+<div style='display:flex; gap:20px; flex-wrap:wrap; margin-top:20px;'>
+<div style='flex:1; min-width:280px; background-color:{desc_bg}; padding:15px; border-radius:12px; text-align:center; box-shadow: 0px 3px 8px rgba(0,0,0,0.1);'>
+<h4 style='color:{highlight};'>Easy Input</h4>
+<p style='color:{desc_text};'>Upload a FASTA file or paste sequences directly. No formatting headaches.</p>
+</div>
+<div style='flex:1; min-width:280px; background-color:{desc_bg}; padding:15px; border-radius:12px; text-align:center; box-shadow: 0px 3px 8px rgba(0,0,0,0.1);'>
+<h4 style='color:{highlight};'>Instant Analysis</h4>
+<p style='color:{desc_text};'>Get GC% stats, charts, and downloadable reports in one click.</p>
+</div>
+</div>
+<div style='background-color:{desc_bg}; padding:20px; border-radius:12px; margin-top:20px;'>
+<h3 style='color:{highlight}; margin-top:0;'> For Non-biologists:</h3>
+<p style='font-size:16px; color:{desc_text};'>
+Think of your DNA like a recipe written in four letters: A, T, G, and C. 
+This app checks how much of your recipe is made up of the 'stronger ingredients' - G and C. 
+The more GC you’ve got, the tougher your DNA tends to be. It’s that simple!
+</p>
+</div>
+"""
+
+# Summary metric card; {title} and {value} are filled in per metric
+_CARD_HTML = """
+<div style='background-color:{metric_bg}; color:{text_color}; padding:20px; border-radius:10px; text-align:center; box-shadow:0px 3px 8px rgba(0,0,0,0.1);'>
+    <h4>{title}</h4>
+    <h3>{value:.2f}</h3>
+</div>
+"""
+
+ABOUT_HTML = {theme: _INTRO_HTML.format(**colors) for theme, colors in THEME_COLORS.items()}
+
+CARD_TEMPLATE = {
+    theme: _CARD_HTML.replace("{metric_bg}", colors["metric_bg"]).replace("{text_color}", colors["text_color"])
+    for theme, colors in THEME_COLORS.items()
+}